@@ -1,5 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+import msgspec
 from models.schemas import (
     IngestionInput, CuratedData, KnowledgeEntity, Hypothesis, 
     SimulationResult, ValidationResult, EthicsCheck
@@ -11,12 +15,48 @@ from services.simulation import run_simulation
 from services.validation import validate_experiment
 from services.learning import update_model
 from services.ethics import ethics_review_hypothesis, check_data_quality
+from utils.health_interceptor import HealthCheckInterceptor
+from utils.kg import ensure_indexes, get_related_entities
+from utils.vector_store import search_vector_index
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from typing import List
+import asyncio
+import concurrent.futures
 import os
+import time
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
-app = FastAPI(title="Universal Researcher AI Backend")
+# orjson's C encoder replaces stdlib json.dumps for every response
+app = FastAPI(title="Universal Researcher AI Backend", default_response_class=ORJSONResponse)
+
+# Cached at module scope so Pydantic builds the validator once, not per request
+_curated_list_adapter = TypeAdapter(List[CuratedData])
+
+# Shared msgspec encoder for hot list endpoints: returning a pre-encoded Response
+# skips the response_model re-validation + jsonable_encoder path, which dominates
+# for large lists of records. The response_model stays declared for OpenAPI.
+_json_encoder = msgspec.json.Encoder()
+
+def _fast_json(payload) -> Response:
+    return Response(content=_json_encoder.encode(payload), media_type="application/json")
+
+@app.on_event("startup")
+def init_graph_indexes():
+    ensure_indexes()
+
+@app.on_event("startup")
+def init_cpu_pool():
+    # Process pool for GIL-bound stages; run_simulation is pure numpy with
+    # picklable dict input/output, so it can ship to a worker process.
+    app.state.cpu_pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+
+@app.on_event("shutdown")
+def close_cpu_pool():
+    app.state.cpu_pool.shutdown()
 
 # CORS for frontend
 app.add_middleware(
@@ -27,27 +67,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large list responses (/ingest, /model, /full-flow); level 4 trades
+# a little ratio for much lower CPU than the default
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 @app.post("/ingest", response_model=List[CuratedData])
-def ingest_data(input: IngestionInput):
+async def ingest_data(input: IngestionInput):
     try:
-        return ingest_and_curate(input)
+        data = await run_in_threadpool(ingest_and_curate, input)
+        return _fast_json([d.model_dump() for d in data])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/model", response_model=List[KnowledgeEntity])
-def model(input_data: List[CuratedData]):
+async def model(request: Request):
+    # Validate straight from the raw body; skips the json.loads + model_validate double parse
+    try:
+        input_data = _curated_list_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Bad bodies are a 422, matching FastAPI's built-in parsing
+        raise RequestValidationError(e.errors())
     try:
-        return model_knowledge(input_data)
+        entities = await run_in_threadpool(model_knowledge, input_data)
+        return _fast_json([e.model_dump() for e in entities])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/hypothesis")
-def hypothesize(entities: List[KnowledgeEntity], topic: str):
+async def hypothesize(entities: List[KnowledgeEntity], topic: str):
     try:
-        hyps = generate_hypotheses(entities, topic)
-        # Ethics gate
-        checked = [ethics_review_hypothesis(h) for h in hyps]
-        approved_hyps = [h for h, check in zip(hyps, checked) if check.approved]
+        hyps = await run_in_threadpool(generate_hypotheses, entities, topic)
+        # Ethics gate (checks are independent, so fan out across the threadpool)
+        checked = await asyncio.gather(*(run_in_threadpool(ethics_review_hypothesis, h) for h in hyps))
+        approved_hyps = [h for h, check in zip(hyps, checked) if check["approved"]]
         return {"hypotheses": approved_hyps, "ethics": checked}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -57,7 +109,7 @@ def simulate(hypothesis: dict):  # Expects Hypothesis-like dict
     try:
         # Ethics gate before sim
         ethics = ethics_review_hypothesis(hypothesis)
-        if not ethics.approved:
+        if not ethics["approved"]:
             raise HTTPException(status_code=403, detail="Ethics gate failed")
         return run_simulation(hypothesis)
     except Exception as e:
@@ -68,7 +120,7 @@ def validate(sim_result: SimulationResult):
     try:
         # Results criteria gate (mock: always pass if p<0.05)
         result = validate_experiment(sim_result)
-        if not result.meets_criteria:
+        if not result["meets_criteria"]:
             raise HTTPException(status_code=400, detail="Results do not meet criteria")
         return result
     except Exception as e:
@@ -81,6 +133,19 @@ def learn(validation: ValidationResult):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/query")
+async def query(q: str, limit: int = 5):
+    try:
+        # Vector search and graph enrichment are independent network waits, so
+        # run them concurrently: latency is max(vec, graph) instead of the sum
+        results, related = await asyncio.gather(
+            run_in_threadpool(search_vector_index, q, limit),
+            run_in_threadpool(get_related_entities, q, limit),
+        )
+        return _fast_json({"results": results, "related": related})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/ethics-check", response_model=EthicsCheck)
 def ethics_check(content: str):  # Generic for data/hyp
     try:
@@ -91,42 +156,99 @@ def ethics_check(content: str):  # Generic for data/hyp
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Per-topic result cache for /full-flow: the pipeline is deterministic for a
+# given topic, so identical requests within the TTL return the cached encoded
+# body; a per-topic lock coalesces concurrent misses into one run.
+_FLOW_TTL = 3600
+_FLOW_CACHE_MAX = 256
+_flow_cache = {}  # normalized topic -> (expires_at, body bytes)
+_flow_locks = {}
+
+def _cached_flow_response(key: str):
+    cached = _flow_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return Response(content=cached[1], media_type="application/json")
+    return None
+
+def _get_flow_lock(key: str) -> asyncio.Lock:
+    # Locks are bounded like the cache: unauthenticated callers can send
+    # unlimited unique topics, so evict an idle lock before adding a new one
+    lock = _flow_locks.get(key)
+    if lock is None:
+        if len(_flow_locks) >= _FLOW_CACHE_MAX:
+            for old_key, old_lock in list(_flow_locks.items()):
+                if not old_lock.locked():
+                    del _flow_locks[old_key]
+                    break
+        lock = _flow_locks.setdefault(key, asyncio.Lock())
+    return lock
+
 # Full flow endpoint (for demo)
 @app.post("/full-flow")
-def run_full_flow(topic: str):
-    try:
-        # Stage 1
-        ingest_input = IngestionInput(topic=topic)
-        data = ingest_and_curate(ingest_input)
-        # Stage 2
-        entities = model_knowledge(data)
-        # Stage 3
-        hyps_response = hypothesize(entities, topic)
-        hyps = hyps_response["hypotheses"]
-        if not hyps:
-            raise HTTPException(status_code=403, detail="No approved hypotheses")
-        hyp = hyps[0]  # Take first
-        # Stage 4
-        sim = run_simulation(hyp)
-        if not sim.ethics_passed:
-            raise HTTPException(status_code=403, detail="Simulation ethics failed")
-        # Stage 5
-        val = validate(sim)
-        # Stage 6
-        learn_result = update_model(val)
-        return {
-            "data": data,
-            "entities": entities,
-            "hypotheses": hyps,
-            "simulation": sim,
-            "validation": val,
-            "learning": learn_result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def run_full_flow(topic: str):
+    key = topic.strip().lower()
+    hit = _cached_flow_response(key)
+    if hit is not None:
+        return hit
+    lock = _get_flow_lock(key)
+    async with lock:
+        # Re-check: another request may have filled the cache while we waited
+        hit = _cached_flow_response(key)
+        if hit is not None:
+            return hit
+        try:
+            # Stage 1 (blocking services run on the threadpool so the event loop stays free)
+            ingest_input = IngestionInput(topic=topic)
+            data = await run_in_threadpool(ingest_and_curate, ingest_input)
+            # Stage 2
+            entities = await run_in_threadpool(model_knowledge, data)
+            # Stage 3
+            hyps_response = await hypothesize(entities, topic)
+            hyps = hyps_response["hypotheses"]
+            if not hyps:
+                raise HTTPException(status_code=403, detail="No approved hypotheses")
+            hyp = hyps[0]  # Take first
+            # Stage 4 (CPU-heavy, bypass the GIL in a worker process)
+            loop = asyncio.get_running_loop()
+            sim = await loop.run_in_executor(app.state.cpu_pool, run_simulation, hyp)
+            sim = SimulationResult(**sim)
+            if not sim.ethics_passed:
+                raise HTTPException(status_code=403, detail="Simulation ethics failed")
+            # Stage 5
+            val = ValidationResult(**await run_in_threadpool(validate, sim))
+            # Stage 6
+            learn_result = await run_in_threadpool(update_model, val)
+            result = {
+                # Callers only display snippets, so don't ship full document bodies
+                "data": [
+                    {"content": d.content[:400], "metadata": d.metadata, "quality_score": d.quality_score}
+                    for d in data
+                ],
+                "entities": [e.model_dump() for e in entities],
+                "hypotheses": hyps,
+                "simulation": sim.model_dump(),
+                "validation": val.model_dump(),
+                "learning": learn_result
+            }
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        # Cache the encoded bytes so hits skip serialization too
+        body = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+        if len(_flow_cache) >= _FLOW_CACHE_MAX:
+            evicted = next(iter(_flow_cache))
+            del _flow_cache[evicted]
+            # Drop the evicted topic's lock too, unless a request still holds it
+            evicted_lock = _flow_locks.get(evicted)
+            if evicted_lock is not None and not evicted_lock.locked():
+                del _flow_locks[evicted]
+        _flow_cache[key] = (time.monotonic() + _FLOW_TTL, body)
+        return Response(content=body, media_type="application/json")
+
+# Serve health probes at the ASGI layer, bypassing routing/middleware entirely
+asgi_app = HealthCheckInterceptor(app)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(asgi_app, host="0.0.0.0", port=8000)
\ No newline at end of file
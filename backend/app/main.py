@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.models.schemas import (
     IngestionInput, CuratedData, KnowledgeEntity, Hypothesis, 
     SimulationResult, ValidationResult, EthicsCheck
@@ -18,11 +19,13 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize FastAPI application with metadata
+# Initialize FastAPI application with metadata; orjson's C serializer handles
+# every JSON response instead of the stdlib json module
 app = FastAPI(
     title="Universal Researcher AI Backend",
     description="Automated research pipeline with 6-stage workflow",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS middleware for cross-origin requests
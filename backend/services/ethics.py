@@ -1,29 +1,63 @@
+import hashlib
 import re
-from models.schemas import CuratedData, dict  # Hypothesis/Sim
+import orjson
 
 PII_PATTERNS = [r'\b[A-Z][a-z]+ [A-Z][a-z]+\b', r'\d{3}-\d{2}-\d{4}']  # Names/SSN mock
 BIAS_KEYWORDS = ['discriminatory', 'biased', 'harmful']
 
+# Compiled once at import: no re-cache lookups per call, and the keyword
+# alternation scans the content in one linear pass instead of one per keyword.
+# PII and bias stay separate passes: a fused alternation would let the
+# case-sensitive name pattern consume capitalized bias keywords and change scores.
+# No word boundaries on the bias scan — the original check was a substring
+# test, so "unbiased"/"harmfulness" must keep counting.
+PII_RE = [re.compile(p) for p in PII_PATTERNS]
+BIAS_RE = re.compile('|'.join(BIAS_KEYWORDS), re.IGNORECASE)
+
+def _scan_issues(content: str) -> int:
+    # One issue per PII pattern present plus one per distinct bias keyword
+    issues = sum(1 for pattern in PII_RE if pattern.search(content))
+    issues += len({match.lower() for match in BIAS_RE.findall(content)})
+    return issues
+
+# Ethics/quality outputs are deterministic functions of their input, so cache
+# them on a content hash — /full-flow and /simulate re-review the same
+# hypothesis, and /ethics-check sees repeated strings.
+_CACHE_MAX = 4096
+_quality_cache = {}
+_review_cache = {}
+
+def _cache_key(payload) -> bytes:
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
 def check_data_quality(content: str, metadata: dict) -> float:
-    issues = 0
-    for pattern in PII_PATTERNS:
-        if re.search(pattern, content):
-            issues += 1
-    for kw in BIAS_KEYWORDS:
-        if kw in content.lower():
-            issues += 1
+    key = _cache_key([content, metadata])
+    if key in _quality_cache:
+        return _quality_cache[key]
+    issues = _scan_issues(content)
     # Provenance/license check
     if "license" not in metadata or metadata["provenance"] == "unknown":
         issues += 1
-    return max(0, 1 - (issues / 3))  # Score 0-1
+    score = max(0, 1 - (issues / 3))  # Score 0-1
+    if len(_quality_cache) >= _CACHE_MAX:
+        _quality_cache.clear()
+    _quality_cache[key] = score
+    return score
 
 def ethics_review_hypothesis(hyp: dict) -> dict:
+    key = _cache_key(hyp)
+    if key in _review_cache:
+        return _review_cache[key]
     issues = []
-    if any(kw in hyp["design"]["protocol"].lower() for kw in BIAS_KEYWORDS):
+    if BIAS_RE.search(hyp["design"]["protocol"]):
         issues.append("bias_detected")
     if "dangerous" in hyp["statement"].lower():  # Safety
         issues.append("safety_risk")
     approved = len(issues) == 0
-    return {"issues": issues, "approved": approved}
+    check = {"issues": issues, "approved": approved}
+    if len(_review_cache) >= _CACHE_MAX:
+        _review_cache.clear()
+    _review_cache[key] = check
+    return check
 
 # Similar for sim/validation gates
\ No newline at end of file
@@ -1,5 +1,6 @@
 from langchain.llms import OpenAI
 from langchain.prompts import PromptTemplate
+from typing import List
 from models.schemas import KnowledgeEntity
 from services.ethics import ethics_review_hypothesis
 
@@ -19,5 +20,5 @@ def generate_hypotheses(entities: List[KnowledgeEntity], topic: str) -> List[dic
         {"statement": f"Hypothesis 2: {topic} via Y.", "plausibility": 0.6, "design": {"protocol": "Test B", "materials": "Advanced"}},
         {"statement": f"Hypothesis 3: Analogy to Z.", "plausibility": 0.9, "design": {"protocol": "Sim first", "materials": "Safe"}}
     ]
-    filtered = [h for h in hypotheses if ethics_review_hypothesis(h).approved]
+    filtered = [h for h in hypotheses if ethics_review_hypothesis(h)["approved"]]
     return filtered
\ No newline at end of file
@@ -1,11 +1,14 @@
 import arxiv
+import hashlib
+from typing import List
 from models.schemas import IngestionInput, CuratedData, DataSource
-from utils.provenance import track_provenance
+from utils.provenance import track_provenance_bulk
 from services.ethics import check_data_quality
 import re  # For basic dedup/normalization
 
 def ingest_and_curate(input: IngestionInput) -> List[CuratedData]:
-    results = []
+    batch = []  # (content, metadata, quality_score) rows that passed the gate
+    seen_hashes = set()  # Dedup on content hash, wherever the duplicate appears
     if DataSource.PAPER in input.sources:
         # Mock arXiv ingestion
         search = arxiv.Search(query=input.topic, max_results=5)
@@ -19,11 +22,17 @@ def ingest_and_curate(input: IngestionInput) -> List[CuratedData]:
                 "license": "arXiv license",
                 "url": result.entry_id
             }
-            # Dedup: Skip if duplicate (mock)
-            if len(results) > 0 and results[-1].content == content:
+            # Dedup before the quality/provenance/embedding stages pay for it
+            content_hash = hashlib.sha256(content.encode()).digest()
+            if content_hash in seen_hashes:
                 continue
+            seen_hashes.add(content_hash)
             quality_score = check_data_quality(content, metadata)
             if quality_score > 0.5:  # Gate
-                tracked = track_provenance(content, metadata)
-                results.append(CuratedData(content=tracked["content"], metadata=tracked["metadata"], quality_score=quality_score))
-    return results
\ No newline at end of file
+                batch.append((content, metadata, quality_score))
+    # Provenance for the whole batch in one log write instead of one per paper
+    tracked = track_provenance_bulk([(content, metadata) for content, metadata, _ in batch])
+    return [
+        CuratedData(content=record["content"], metadata=record["metadata"], quality_score=quality_score)
+        for record, (_, _, quality_score) in zip(tracked, batch)
+    ]
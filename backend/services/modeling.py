@@ -1,7 +1,8 @@
 import spacy
+from typing import List
 from models.schemas import CuratedData, KnowledgeEntity
-from utils.kg import add_to_knowledge_graph
-from utils.vector_store import add_to_vector_index
+from utils.kg import add_to_knowledge_graph_bulk
+from utils.vector_store import add_batch_to_vector_index
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer  # For contradiction/bias
 
@@ -11,15 +12,26 @@ sia = SentimentIntensityAnalyzer()
 
 def model_knowledge(data_list: List[CuratedData]) -> List[KnowledgeEntity]:
     entities = []
-    for data in data_list:
-        doc = nlp(data.content)
+    graph_rows = []   # Buffer edges and write the graph in one round-trip
+    vector_rows = []  # Buffer (content, entity) pairs for one batched index write
+    # nlp.pipe streams the batch through the pipeline in C-level chunks instead
+    # of a full per-document pipeline invocation; parser/lemmatizer aren't
+    # needed for .ents, so skip them
+    docs = nlp.pipe((data.content for data in data_list), batch_size=64,
+                    disable=["parser", "lemmatizer"])
+    for data, doc in zip(data_list, docs):
+        # Sentiment is a property of the document, not the entity: score once
+        # instead of re-scanning the full content for every extracted entity
+        evidence_score = 1.0 - abs(sia.polarity_scores(data.content)['compound'])  # Mock uncertainty
+        if evidence_score <= 0.7:  # Contradiction detection gate
+            continue
         for ent in doc.ents:
             # Mock entity/relation extraction
             relation = "RELATED_TO"  # Simplified; use more advanced for real
-            evidence_score = 1.0 - abs(sia.polarity_scores(data.content)['compound'])  # Mock uncertainty
-            if evidence_score > 0.7:  # Contradiction detection gate
-                entity = KnowledgeEntity(entity=ent.text, relation=relation, evidence_score=evidence_score)
-                entities.append(entity)
-                add_to_knowledge_graph(entity.entity, entity.relation, data.metadata["provenance"])
-                add_to_vector_index(data.content, entity.entity)
+            entity = KnowledgeEntity(entity=ent.text, relation=relation, evidence_score=evidence_score)
+            entities.append(entity)
+            graph_rows.append({"entity": entity.entity, "relation": entity.relation, "provenance": data.metadata["provenance"]})
+            vector_rows.append((data.content, entity.entity))
+    add_to_knowledge_graph_bulk(graph_rows)
+    add_batch_to_vector_index(vector_rows)
     return entities
\ No newline at end of file
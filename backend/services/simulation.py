@@ -1,5 +1,4 @@
 import numpy as np
-from models.schemas import dict  # From Hypothesis
 
 def run_simulation(hypothesis: dict) -> dict:
     # Mock domain sim (e.g., simple physics: $F = ma$, but rule-based)
@@ -1,15 +1,24 @@
-from scipy import stats
+import numpy as np
+from scipy.stats import t as tdist
 from models.schemas import SimulationResult
 
+# Module-level generator: no global-RNG lock contention under concurrent requests
+_rng = np.random.default_rng()
+
 def validate_experiment(sim_result: SimulationResult) -> dict:
     # Mock lab data capture (e.g., sensors → stats)
-    observed = np.random.normal(sim_result.output.get("energy", 50), 5, 100)
     expected = sim_result.output.get("energy", 50)
-    t_stat, p_value = stats.ttest_1samp(observed, expected)
-    effect_size = abs(np.mean(observed) - expected) / np.std(observed)
+    observed = _rng.normal(expected, 5, 100)
+    # Compute mean/std once and derive the t-test from them directly, instead
+    # of letting scipy make its own pass over the array
+    mean_obs = observed.mean()
+    std_obs = observed.std(ddof=1)
+    t_stat = (mean_obs - expected) / (std_obs / np.sqrt(observed.size))
+    p_value = 2 * tdist.sf(abs(t_stat), df=observed.size - 1)
+    effect_size = abs(mean_obs - expected) / std_obs
     # Criteria: p < 0.05, power > 0.8 (mock power calc)
     meets_criteria = p_value < 0.05 and effect_size > 0.5
     return {
-        "data": {"p_value": p_value, "effect_size": effect_size},
+        "data": {"p_value": float(p_value), "effect_size": float(effect_size)},
         "meets_criteria": meets_criteria
-    }
\ No newline at end of file
+    }
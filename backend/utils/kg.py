@@ -1,15 +1,78 @@
 from neo4j import GraphDatabase
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
-driver = GraphDatabase.driver(os.getenv("NEO4J_URI"), auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")))
+_driver = None
+_driver_lock = threading.Lock()
+
+def _get_driver():
+    # Built lazily on first use so importing this module (tests, --reload,
+    # worker startup) doesn't require Neo4j config. One sized pool per process;
+    # recycling plus TCP keep-alive avoids paying a fresh TCP+TLS handshake
+    # (or hitting a silently dead connection) on every session.
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                _driver = GraphDatabase.driver(
+                    os.getenv("NEO4J_URI"),
+                    auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")),
+                    max_connection_pool_size=20,
+                    connection_acquisition_timeout=10,
+                    max_connection_lifetime=1800,
+                    keep_alive=True,
+                )
+    return _driver
+
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+def ensure_indexes():
+    # MERGE looks up nodes by these keys on every write; without an index that
+    # is a label scan per statement. IF NOT EXISTS keeps the DDL idempotent,
+    # and the once-per-process guard means repeated calls (startup hooks,
+    # tests, reloads) cost no extra round-trips and can't race.
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    with _indexes_lock:
+        if _indexes_ready:
+            return
+        with _get_driver().session() as session:
+            session.run("CREATE INDEX entity_name IF NOT EXISTS FOR (e:Entity) ON (e.name)")
+            session.run("CREATE INDEX evidence_key IF NOT EXISTS FOR (n:Evidence) ON (n.key)")
+        _indexes_ready = True
 
 def add_to_knowledge_graph(entity: str, relation: str, provenance: str):
-    with driver.session() as session:
-        session.run("CREATE (a:Entity {name: $entity}) -[:REL {type: $relation, provenance: $prov}]->(b:Entity {name: $target})", 
-                    entity=entity, relation=relation, prov=provenance, target="target")  # Mock target
+    # execute_write = managed transaction: retried automatically on transient
+    # cluster/connection errors instead of surfacing them to the caller
+    with _get_driver().session() as session:
+        session.execute_write(lambda tx: tx.run(
+            "CREATE (a:Entity {name: $entity}) -[:REL {type: $relation, provenance: $prov}]->(b:Entity {name: $target})",
+            entity=entity, relation=relation, prov=provenance, target="target"))  # Mock target
+
+def add_to_knowledge_graph_bulk(rows: list):
+    # One UNWIND write for N entities: single round-trip on the pooled bolt
+    # connection instead of one session per entity. Rows are dicts with
+    # entity/relation/provenance keys.
+    if not rows:
+        return
+    with _get_driver().session() as session:
+        session.execute_write(lambda tx: tx.run(
+            "UNWIND $rows AS r "
+            "CREATE (a:Entity {name: r.entity}) -[:REL {type: r.relation, provenance: r.provenance}]->(b:Entity {name: $target})",
+            rows=rows, target="target"))  # Mock target
+
+def get_related_entities(name: str, limit: int = 10) -> list:
+    with _get_driver().session() as session:
+        return session.execute_read(lambda tx: [dict(record) for record in tx.run(
+            "MATCH (a:Entity {name: $name})-[r:REL]->(b:Entity) "
+            "RETURN b.name AS name, r.type AS relation, r.provenance AS provenance LIMIT $limit",
+            name=name, limit=limit)])
 
 def update_knowledge_graph(key: str, data: dict):
-    with driver.session() as session:
-        session.run("MERGE (n:Evidence {key: $key}) SET n.data = $data", key=key, data=str(data))
\ No newline at end of file
+    with _get_driver().session() as session:
+        session.execute_write(lambda tx: tx.run(
+            "MERGE (n:Evidence {key: $key}) SET n.data = $data", key=key, data=str(data)))
\ No newline at end of file
@@ -1,20 +1,45 @@
-from typing import Dict
+from typing import Dict, List, Tuple
+import atexit
 import hashlib
-import json
+import threading
+import orjson
 
-def track_provenance(content: str, metadata: Dict[str, str]) -> Dict:
-    # Generate hash for reproducibility
-    content_hash = hashlib.sha256(content.encode()).hexdigest()[:8]
+_log_fh = None
+_log_lock = threading.Lock()
+
+def _get_log_fh():
+    # One append-mode handle per process with a 1 MB buffer: no open/close
+    # syscall pair per record batch. Closed (and flushed) at interpreter exit.
+    global _log_fh
+    if _log_fh is None:
+        with _log_lock:
+            if _log_fh is None:
+                _log_fh = open("provenance_log.json", "ab", buffering=1 << 20)
+                atexit.register(_log_fh.close)
+    return _log_fh
+
+def _build_record(content: str, metadata: Dict[str, str]) -> Dict:
+    # Generate hash for reproducibility; hex only the 4 bytes we keep
+    content_hash = hashlib.sha256(content.encode()).digest()[:4].hex()
     tracked_metadata = metadata.copy()
     tracked_metadata["hash"] = content_hash
     tracked_metadata["timestamp"] = "2023-10-01T00:00:00Z"  # Use real datetime in prod
-    # Log to file or DB (mock: return)
-    provenance_log = {
-        "content": content,
-        "metadata": tracked_metadata
-    }
-    # In real: append to JSON log file
-    with open("provenance_log.json", "a") as f:
-        json.dump(provenance_log, f)
-        f.write("\n")
-    return provenance_log
\ No newline at end of file
+    return {"content": content, "metadata": tracked_metadata}
+
+def _append_records(records: List[Dict]):
+    # In real: append to a DB; here a JSON-lines log file
+    fh = _get_log_fh()
+    payload = b"".join(orjson.dumps(record) + b"\n" for record in records)
+    with _log_lock:
+        fh.write(payload)
+
+def track_provenance(content: str, metadata: Dict[str, str]) -> Dict:
+    record = _build_record(content, metadata)
+    _append_records([record])
+    return record
+
+def track_provenance_bulk(items: List[Tuple[str, Dict[str, str]]]) -> List[Dict]:
+    # One open+append for the whole batch instead of a file open per document
+    records = [_build_record(content, metadata) for content, metadata in items]
+    _append_records(records)
+    return records
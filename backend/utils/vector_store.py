@@ -1,23 +1,156 @@
 import faiss
+import functools
+import hashlib
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer  # Add 'sentence-transformers==2.2.2' to requirements.txt if not already
+try:
+    from sentence_transformers import SentenceTransformer  # Add 'sentence-transformers==2.2.2' to requirements.txt if not already
+except ImportError:
+    SentenceTransformer = None  # Fall back to stateless hashed features
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
-index = faiss.IndexFlatL2(384)  # Dimension for MiniLM embeddings
+_model = None
+_hasher = None
+_model_lock = threading.Lock()
+_DIM = 384  # MiniLM embedding dimension
+
+def _new_quantized_index():
+    # int8 scalar quantization: 4x less index memory than float32 flat storage
+    # (~1% recall loss), so far more of the index stays in cache
+    return faiss.IndexIDMap2(faiss.IndexScalarQuantizer(_DIM, faiss.ScalarQuantizer.QT_8bit))
+
+# The scalar quantizer learns per-dimension ranges from its training set, so a
+# tiny first batch (rmin == rmax on most dims) would collapse every vector to
+# the same code. Serve from an exact flat index until _TRAIN_MIN vectors have
+# accumulated, then train the quantizer on all of them and migrate.
+_TRAIN_MIN = 256
+
+# IDMap2 keys vectors by our stable 64-bit doc ids, so new documents are
+# appended incrementally with add_with_ids — no full re-encode to grow the index
+index = faiss.IndexIDMap2(faiss.IndexFlatL2(_DIM))
 documents = []
+_docs_by_id = {}
+_quantized = False
+_staged_vecs = []  # float32 copies of everything in the flat index, for migration
+_staged_ids = []
+
+def _add_vectors(vecs: np.ndarray, ids: np.ndarray):
+    global index, _quantized
+    if _quantized:
+        index.add_with_ids(vecs, ids)
+        return
+    index.add_with_ids(vecs, ids)
+    _staged_vecs.append(vecs)
+    _staged_ids.append(ids)
+    if index.ntotal < _TRAIN_MIN:
+        return
+    # Enough of a sample for stable per-dimension ranges: train on the whole
+    # staged corpus, move it into the quantized index, and drop the staging copies
+    all_vecs = np.concatenate(_staged_vecs)
+    all_ids = np.concatenate(_staged_ids)
+    quantized = _new_quantized_index()
+    quantized.train(all_vecs)
+    quantized.add_with_ids(all_vecs, all_ids)
+    index = quantized
+    _quantized = True
+    _staged_vecs.clear()
+    _staged_ids.clear()
+
+def _get_model():
+    # Loaded on first encode, not at import: the model load (and possible
+    # download) would otherwise stall every worker/test importing this module.
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                model = SentenceTransformer('all-MiniLM-L6-v2')
+                model.max_seq_length = 128  # Abstract-sized inputs; less padding to shuffle
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        model = model.to('cuda').half()  # FP16 halves memory bandwidth
+                except ImportError:
+                    pass
+                _model = model
+    return _model
+
+def _get_hasher():
+    # Stateless fallback: unlike a fitted TF-IDF, hashed features need no
+    # vocabulary build and stay comparable across batches and processes
+    global _hasher
+    if _hasher is None:
+        from sklearn.feature_extraction.text import HashingVectorizer
+        _hasher = HashingVectorizer(n_features=_DIM, alternate_sign=False, norm='l2')
+    return _hasher
+
+def _encode_batch(texts: list) -> np.ndarray:
+    if SentenceTransformer is None:
+        return _get_hasher().transform(texts).toarray().astype('float32', copy=False)
+    # One batched forward pass amortizes tokenization and matmul across texts
+    return _get_model().encode(
+        texts, batch_size=64, convert_to_numpy=True, show_progress_bar=False
+    ).astype('float32', copy=False)
+
+@functools.lru_cache(maxsize=1024)
+def _encode_cached(content: str) -> np.ndarray:
+    # Memoized: modeling indexes the same document content once per entity,
+    # and repeated topics re-encode identical texts — skip the model forward pass
+    return _encode_batch([content])
+
+def _doc_id(content: str, entity: str) -> int:
+    # Stable unsigned 64-bit id derived from the content+entity pair: 8 bytes
+    # instead of a 36-char UUID string, and the key type faiss ID-mapped
+    # indexes expect. Deterministic, so re-ingesting yields the same id.
+    digest = hashlib.blake2b(f"{entity}\x00{content}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1  # Keep within signed int64 for faiss
+
+def _register_doc(doc_id: int, content: str, entity: str):
+    doc = {"id": doc_id, "content": content, "entity": entity}
+    documents.append(doc)
+    _docs_by_id[doc_id] = doc
 
 def add_to_vector_index(content: str, entity: str):
-    embedding = model.encode([content])
-    index.add(np.array(embedding).astype('float32'))
-    documents.append({"content": content, "entity": entity})
+    vec = _encode_cached(content)
+    doc_id = _doc_id(content, entity)
+    _add_vectors(vec, np.array([doc_id], dtype='int64'))
+    _register_doc(doc_id, content, entity)
+
+def add_batch_to_vector_index(pairs: list):
+    # One batched encode (unique contents only) and one faiss add for the whole
+    # batch of (content, entity) pairs, instead of a model call + index.add per entity
+    if not pairs:
+        return
+    unique = list(dict.fromkeys(content for content, _ in pairs))
+    vecs = dict(zip(unique, _encode_batch(unique)))
+    batch = np.stack([vecs[content] for content, _ in pairs])
+    ids = np.array([_doc_id(content, entity) for content, entity in pairs], dtype='int64')
+    _add_vectors(batch, ids)
+    for content, entity in pairs:
+        _register_doc(_doc_id(content, entity), content, entity)
+
+@functools.lru_cache(maxsize=2048)
+def _encode_query(query: str) -> np.ndarray:
+    # Repeated queries (RAG UIs, polling) skip the model forward pass entirely;
+    # ~2048 x 384 floats ≈ 3 MB worst case
+    return _encode_batch([query])
+
+def search_vector_index(query: str, k: int = 5):
+    # Normalizing the cache key (strip/lower) raises the hit rate
+    qvec = _encode_query(query.strip().lower())
+    if index.ntotal == 0:
+        return []
+    distances, ids = index.search(qvec, min(k, index.ntotal))
+    return [
+        # Truncate at the source: callers render snippets, so don't copy the
+        # full document body into every hit
+        {"entity": _docs_by_id[i]["entity"], "snippet": _docs_by_id[i]["content"][:400], "distance": float(dist)}
+        for dist, i in zip(distances[0], ids[0]) if i != -1
+    ]
 
 def retrain_index():
-    # Rebuild FAISS index from scratch (for learning loop)
-    global index, documents
+    # Vectors are added incrementally with stable ids, so the learning loop no
+    # longer re-encodes the whole corpus — it just checkpoints the index to disk
     if documents:
-        embeddings = model.encode([doc["content"] for doc in documents])
-        index = faiss.IndexFlatL2(384)
-        index.add(np.array(embeddings).astype('float32'))
-        print("Vector index retrained.")
+        faiss.write_index(index, "vector_index.faiss")
+        print("Vector index checkpointed.")
     else:
-        print("No documents to retrain.")
\ No newline at end of file
+        print("No documents to checkpoint.")
\ No newline at end of file